@@ -1,11 +1,13 @@
+import hashlib
+import json
 import os
-from copy import deepcopy
 
 import omegaconf
 import yaml
 from omegaconf import OmegaConf
 
 from mlxp._internal._interactive_mode import InteractiveModeHandler, _bcolors, _printc
+from mlxp.data_structures import schemas
 from mlxp.data_structures.schemas import Metadata
 from mlxp.errors import InvalidConfigFileError
 from mlxp.mlxpsub import scheduler_env_var
@@ -69,10 +71,10 @@ def _process_overrides(overrides):
         # overrides_mlxp = OmegaConf.to_container(cfg.hydra.overrides.task, resolve=False)
         overrides_mlxp = OmegaConf.create({"mlxp": overrides.mlxp})
     #        cfg = OmegaConf.merge(cfg, overrides_mlxp)
-        omegaconf.OmegaConf.set_struct(overrides, True)
-        with omegaconf.open_dict(overrides):
-            overrides.pop("mlxp")
+        # Each change of the struct flag invalidates the flags cache of the whole
+        # config tree: the flag is only changed once.
         omegaconf.OmegaConf.set_struct(overrides, False)
+        overrides.pop("mlxp")
     else:
         overrides_mlxp = None
 
@@ -101,8 +103,7 @@ def _chek_keys(mlxp_config, valid_keys,mlxp_file):
 
 
 def _get_default_config(config_path):
-    default_config = OmegaConf.structured(Metadata)
-    conf_dict = OmegaConf.to_container(default_config, resolve=True)
+    conf_dict = _get_default_config_dict()
     default_config = OmegaConf.create(conf_dict)
 
     os.makedirs(config_path, exist_ok=True)
@@ -119,6 +120,41 @@ def _get_default_config(config_path):
     return default_config
 
 
+def _get_default_config_dict():
+    # Building the default configs from the structured schemas is costly compared to
+    # reading them back as json: they are cached on disk across launches. The cache
+    # is keyed by the content of the schemas and the version of omegaconf.
+    cache_file = _get_default_config_cache_file()
+    try:
+        with open(cache_file, "r") as file:
+            conf_dict = json.load(file)
+    except (OSError, ValueError):
+        conf_dict = OmegaConf.to_container(OmegaConf.structured(Metadata), resolve=True)
+        _write_default_config_cache(cache_file, conf_dict)
+
+    conf_dict["info"]["work_dir"] = os.getcwd()
+    return conf_dict
+
+
+def _get_default_config_cache_file():
+    with open(schemas.__file__, "rb") as file:
+        key = hashlib.blake2b(file.read() + omegaconf.__version__.encode(), digest_size=8).hexdigest()
+    cache_dir = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(cache_dir, "mlxp", f"default_config-{key}.json")
+
+
+def _write_default_config_cache(cache_file, conf_dict):
+    tmp_file = f"{cache_file}.tmp-{os.getpid()}"
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(tmp_file, "w") as file:
+            json.dump(conf_dict, file)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        # The cache is only an optimization: ignore read-only or full file systems.
+        pass
+
+
 def _save_mlxp_file(mlxp_conf, mlxp_file):
 
     omegaconf.OmegaConf.save(config=mlxp_conf, f=mlxp_file)
@@ -139,6 +175,4 @@ def _process_config_path(config_path, file_name):
     if os.path.isabs(config_path):
         return config_path
     else:
-        abs_path = os.path.abspath(config_path)
-        rel_path = os.path.relpath(abs_path, os.getcwd())
-        return os.path.join(os.path.dirname(file_name), rel_path)
+        return os.path.join(os.path.dirname(file_name), os.path.normpath(config_path))
@@ -1,8 +1,11 @@
 """Artifacts objects that can be saved by a Logger object."""
 
 import os
+import pickle
+import types
 
-import dill as pkl
+# Size of the buffer used when writing and reading pickle files.
+_PICKLE_BUFFER_SIZE = 1 << 20
 
 
 class Artifact:
@@ -16,17 +19,37 @@ class Artifact:
         return self._load(os.path.join(self.path, self.name))
 
 
+class _Pickler(pickle.Pickler):
+    # Functions and classes defined in __main__ are pickled by reference by the
+    # standard pickle module, and could not be loaded from another script.
+    # Those are left to dill, which pickles them by value.
+    def reducer_override(self, obj):
+        if isinstance(obj, (type, types.FunctionType)) and obj.__module__ == "__main__":
+            raise pickle.PicklingError(f"{obj!r} is defined in __main__")
+        return NotImplemented
+
+
 def _save_pickle(obj: object, name: str) -> None:
-    import dill as pkl
+    # The standard pickle module is much faster than dill for saving objects. dill
+    # is only used for objects that pickle does not support (lambdas, local
+    # objects, ...). Both kinds of files are loaded by dill.
+    with open(name, "wb", buffering=_PICKLE_BUFFER_SIZE) as f:
+        try:
+            _Pickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            import dill as pkl
 
-    with open(name, "wb") as f:
-        pkl.dump(obj, f)
+            f.seek(0)
+            f.truncate()
+            pkl.dump(obj, f)
 
 
 def _save_numpy(obj: object, name: str) -> None:
     import numpy as np
 
-    np.savez(name, **obj)
+    # numpy appends the .npz extension to file names but not to open files.
+    with open(name, "wb") as f:
+        np.savez(f, **obj)
 
 
 def _save_image(obj: object, name: str) -> None:
@@ -45,7 +68,7 @@ def _save_torch(obj: object, name: str) -> None:
 def _load_pickle(name: str) -> object:
     import dill as pkl
 
-    with open(name, "rb") as f:
+    with open(name, "rb", buffering=_PICKLE_BUFFER_SIZE) as f:
         return pkl.load(f)
 
 
@@ -67,13 +67,16 @@ def convert_dict(
         src_dict.
     :rtype: Any
     """
-    dst_dict = {}
-    for key, value in src_dict.items():
-        if isinstance(value, src_class):
-            dst_dict[key] = convert_dict(value, src_class=src_class, dst_class=dst_class)
-        else:
-            if isinstance(value, omegaconf.listconfig.ListConfig):
-                value = list(value)
-            dst_dict[key] = value
+    dst_dict = {key: _convert_value(value, src_class, dst_class) for key, value in src_dict.items()}
     dst_dict = dst_class(dst_dict)
     return dst_dict
+
+
+def _convert_value(value, src_class, dst_class):
+    # Dictionaries nested in lists are converted as well.
+    if isinstance(value, src_class):
+        return convert_dict(value, src_class=src_class, dst_class=dst_class)
+    if isinstance(value, (list, tuple, omegaconf.listconfig.ListConfig)):
+        items = [_convert_value(item, src_class, dst_class) for item in value]
+        return tuple(items) if isinstance(value, tuple) else items
+    return value
@@ -52,6 +52,7 @@ class ConfigGitVM(ConfigVersionManager):
         :type: bool
 
         When set to true, the version manager stores a list of requirements and their version.
+        This requires the package pipreqs to be installed.
     """
 
     name: str = "mlxp.GitVM"
@@ -91,12 +92,20 @@ class ConfigLogger:
 
         If true logs the system stdout and stderr of a run to a file named
         "log.stdour" and "log.stderr" in the log directory.
+
+    .. py:attribute:: flush_every
+        :type: int
+
+        Number of lines logged to a same metrics file before writing them to disk.
+        Increasing it reduces the number of writes on slow file systems.
+        (default 1)
     """
 
     name: str = "mlxp.DefaultLogger"
     parent_log_dir: str = os.path.join(".", "logs")
     forced_log_id: int = -1
     log_streams_to_file: bool = False
+    flush_every: int = 1
 
 
 @dataclass
@@ -183,7 +192,7 @@ class Info:
     start_time: Any = ""
     end_date: Any = ""
     end_time: Any = ""
-    work_dir: str = os.getcwd()
+    work_dir: str = field(default_factory=os.getcwd)
     logger: Any = None
     scheduler: Any = None
     version_manager: Any = None
@@ -257,8 +266,8 @@ class MLXPConfig:
         (default True)
     """
 
-    logger: ConfigLogger = field(default_factory=lambda: ConfigLogger())
-    version_manager: ConfigVersionManager = field(default_factory=lambda: ConfigGitVM())
+    logger: ConfigLogger = field(default_factory=ConfigLogger)
+    version_manager: ConfigVersionManager = field(default_factory=ConfigGitVM)
     use_version_manager: bool = False
     use_scheduler: bool = False
     use_logger: bool = True
@@ -291,6 +300,6 @@ class Metadata:
         Contains the user's defined configs that are specific to the run.
     """
 
-    info: Info = field(default_factory=lambda: Info())
-    mlxp: MLXPConfig = field(default_factory=lambda: MLXPConfig())
+    info: Info = field(default_factory=Info)
+    mlxp: MLXPConfig = field(default_factory=MLXPConfig)
     config: Any = None
@@ -54,3 +54,9 @@ class InvalidConfigFileError(Exception):
     """Raised when the mlxp config file contains an invalid field."""
 
     pass
+
+
+class InvalidGitRepositoryError(Exception):
+    """Raised when the code does not belong to a git repository."""
+
+    pass
@@ -3,20 +3,18 @@
 import atexit
 import functools
 import importlib
+import inspect
 import os
+import re
 import signal
 import socket
 import sys
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Callable, Dict, Optional, TypeVar, Union
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, TypeVar, Union
 
-import omegaconf
 import yaml
-from hydra import version
-from hydra._internal.utils import _run_hydra, get_args_parser
-from hydra.core.hydra_config import HydraConfig
-from hydra.types import TaskFunction
 from omegaconf import DictConfig, OmegaConf
 
 from mlxp._internal.configure import _build_config, _process_config_path
@@ -26,6 +24,9 @@ from mlxp.errors import InvalidSchedulerError, MissingFieldError
 from mlxp.logger import Logger
 from mlxp.enumerations import Directories
 from mlxp.scheduler import Schedulers_dict, _create_scheduler
+
+if TYPE_CHECKING:
+    from hydra.types import TaskFunction
 import warnings
 warnings.filterwarnings('ignore', module='hydra')
 
@@ -44,17 +45,18 @@ hydra_defaults_dict = {
     "hydra/hydra_logging": "disabled",
 }
 
+_HYDRA_DEFAULT_OVERRIDES = [f"{key}={value}" for key, value in hydra_defaults_dict.items()]
 
 interactive_mode_file = os.path.join(hydra_defaults_dict["hydra.sweep.dir"], "user_choices.yaml")
 
+# Jobs of a sweep waiting to be submitted to a scheduler once the sweep is complete.
+_pending_jobs = []
+
 
 def _clean_dir():
     sweep_dir = hydra_defaults_dict["hydra.sweep.dir"]
-    try:
-        os.remove(os.path.join(sweep_dir, "multirun.yaml"))
-        os.remove(interactive_mode_file)
-    except FileNotFoundError:
-        pass
+    Path(sweep_dir, "multirun.yaml").unlink(missing_ok=True)
+    Path(interactive_mode_file).unlink(missing_ok=True)
 
 
 def _clean_dir_on_exit(signum, frame):
@@ -70,7 +72,7 @@ signal.signal(signal.SIGTERM, _clean_dir_on_exit)
 
 def launch(
     config_path: str = "configs", seeding_function: Union[Callable[[Any], None], None] = None,
-) -> Callable[[TaskFunction], Any]:
+) -> Callable[["TaskFunction"], Any]:
     """Create a decorator of the main function to be executed.
     :samp:`launch` allows composing configurations from multiple configuration files
     by leveraging hydra (see hydra-core package).
@@ -115,11 +117,13 @@ def launch(
     :type: Callable[[TaskFunction], Any]
 
     """
+    from hydra import version
+
     config_name = "config"
     version_base = None  # by default set the version base for hydra to None.
     version.setbase(version_base)
 
-    def hydra_decorator(task_function: TaskFunction) -> Callable[[], None]:
+    def hydra_decorator(task_function: "TaskFunction") -> Callable[[], None]:
         # task_function = launch(task_function)
         @functools.wraps(task_function)
         def decorated_main(cfg_passthrough: Optional[DictConfig] = None) -> Any:
@@ -128,12 +132,13 @@ def launch(
 
 
             if cfg_passthrough is None:
+                from hydra._internal.utils import _run_hydra, get_args_parser
+
                 args_parser = get_args_parser()
                 args = args_parser.parse_args()
 
                 # Setting hydra defaults
-                hydra_defaults = [key + "=" + value for key, value in hydra_defaults_dict.items()]
-                overrides = args.overrides + hydra_defaults
+                overrides = args.overrides + _HYDRA_DEFAULT_OVERRIDES
                 setattr(args, "overrides", overrides)
                 _clean_dir()
 
@@ -145,6 +150,7 @@ def launch(
                     config_name=config_name,
                 )
 
+                _submit_pending_jobs()
                 _clean_dir()
             else:
                 return task_function(cfg_passthrough)
@@ -156,6 +162,7 @@ def launch(
         @functools.wraps(task_function)
         def decorated_task(overrides):
             co_filename = task_function.__code__.co_filename
+            cwd = os.getcwd()
 
             config, mlxp_cfg, info_cfg, im_handler = _build_config(
                 config_path, config_name, co_filename, overrides, interactive_mode_file
@@ -182,35 +189,32 @@ def launch(
                     info_cfg, "info", {"version_manager": version_manager.get_info()}, merge=True
                 )
             else:
-                work_dir = os.getcwd()
+                work_dir = cwd
 
             # cfg.update({"info": {"work_dir": work_dir}})
             OmegaConf.update(info_cfg, "info", {"work_dir": work_dir}, merge=True)
 
             if mlxp_cfg.mlxp.use_scheduler:
-                try:
-                    scheduler_key = mlxp_cfg.mlxp.scheduler.pop("name")
-                    assert scheduler_key in Schedulers_dict
-                    _create_scheduler(Schedulers_dict[scheduler_key])
-                    class_name = "mlxp.scheduler." + Schedulers_dict[scheduler_key]["name"]
-                    scheduler = instantiate(class_name)(**mlxp_cfg.mlxp.scheduler)
-                    if not mlxp_cfg.mlxp.use_logger:
-                        print("Logger is currently disabled.")
-                        print("To use the scheduler, the logger must be enabled")
-                        print("Enabling the logger...")
-                        OmegaConf.update(mlxp_cfg, "mlxp", {"use_logger": True}, merge=True)
-                        # mlxp_cfg.mlxp.use_logger = True
-                except AssertionError:
+                scheduler_key = mlxp_cfg.mlxp.scheduler.pop("name")
+                if scheduler_key not in Schedulers_dict:
                     error_msg = scheduler_key + " does not correspond to any supported scheduler\n"
                     error_msg += f"Supported schedulers are {list(Schedulers_dict.keys())}"
-                    raise InvalidSchedulerError(error_msg) from None
-                    # scheduler = None
-                    # cfg.mlxp.use_scheduler = False
+                    raise InvalidSchedulerError(error_msg)
+                _create_scheduler(Schedulers_dict[scheduler_key])
+                class_name = "mlxp.scheduler." + Schedulers_dict[scheduler_key]["name"]
+                scheduler = instantiate(class_name)(**mlxp_cfg.mlxp.scheduler)
+                if not mlxp_cfg.mlxp.use_logger:
+                    print("Logger is currently disabled.")
+                    print("To use the scheduler, the logger must be enabled")
+                    print("Enabling the logger...")
+                    OmegaConf.update(mlxp_cfg, "mlxp", {"use_logger": True}, merge=True)
+                    # mlxp_cfg.mlxp.use_logger = True
             else:
                 scheduler = None
 
             if mlxp_cfg.mlxp.use_logger:
-                logger = instantiate(mlxp_cfg.mlxp.logger.pop("name"))(**mlxp_cfg.mlxp.logger)
+                logger_class = instantiate(mlxp_cfg.mlxp.logger.pop("name"))
+                logger = logger_class(**_get_logger_kwargs(logger_class, mlxp_cfg.mlxp.logger))
                 log_id = logger.log_id
                 log_dir = logger.log_dir
                 parent_log_dir = logger.parent_log_dir
@@ -219,7 +223,7 @@ def launch(
                 logger = None
 
             if mlxp_cfg.mlxp.use_scheduler:
-                exec_file = os.path.relpath(info_cfg.info.current_file_path, os.getcwd())
+                exec_file = os.path.relpath(info_cfg.info.current_file_path, cwd)
                 args = _get_overrides()
                 main_cmd = scheduler._main_job_command(
                     info_cfg.info.executable,
@@ -230,14 +234,12 @@ def launch(
                     args
                 )
 
-                scheduler.submit_job(main_cmd, log_dir)
-                OmegaConf.update(info_cfg, "info", {"scheduler": scheduler.get_info()}, merge=True)
-                logger._log_configs(config, "config_unresolved", resolve=False)
-                logger._log_configs(info_cfg.info, "info")
+                job_path = scheduler.save_job_script(main_cmd, log_dir)
+                _pending_jobs.append((scheduler, job_path, logger, config, info_cfg))
 
             else:
                 # ## Setting up the working directory
-                cur_dir = os.getcwd()
+                cur_dir = cwd
                 _set_work_dir(work_dir)
                 OmegaConf.update(info_cfg, "info", {"status": Status.RUNNING.value}, merge=True)
 
@@ -252,9 +254,7 @@ def launch(
                     # cfg.update({"info": {"status": Status.RUNNING.value}})
 
                     if seeding_function:
-                        try:
-                            assert "seed" in config.keys()
-                        except AssertionError:
+                        if "seed" not in config:
                             msg = "Missing field: The 'config' must contain a field named 'seed'\n"
                             msg += "provided as argument to the function 'seeding_function' "
                             raise MissingFieldError(msg)
@@ -268,8 +268,12 @@ def launch(
                         OmegaConf.resolve(config)
 
                     if mlxp_cfg.mlxp.as_ConfigDict:
+                        # OmegaConf converts the whole tree at once, including configs
+                        # nested in lists, then dictionaries are turned into ConfigDict.
                         config = convert_dict(
-                            config, src_class=omegaconf.dictconfig.DictConfig, dst_class=ConfigDict
+                            OmegaConf.to_container(config, resolve=True, throw_on_missing=True),
+                            src_class=dict,
+                            dst_class=ConfigDict,
                         )
 
                     ctx = Context(config=config, mlxp=mlxp_cfg, info=info_cfg, logger=logger)
@@ -283,6 +287,7 @@ def launch(
                     }
                     OmegaConf.update(info_cfg, "info", info, merge=True)
                     if logger:
+                        logger.close()
                         logger._log_configs(info_cfg.info, "info")
 
                     _reset_work_dir(cur_dir)
@@ -296,6 +301,7 @@ def launch(
                     }
                     OmegaConf.update(info_cfg, "info", info, merge=True)
                     if logger:
+                        logger.close()
                         logger._log_configs(info_cfg.info, "info")
 
                     _reset_work_dir(cur_dir)
@@ -307,7 +313,7 @@ def launch(
 
         return decorated_task
 
-    def composed_decorator(task_function: TaskFunction) -> Callable[[], None]:
+    def composed_decorator(task_function: "TaskFunction") -> Callable[[], None]:
         decorated_task = launcher_decorator(task_function)
         task_function = hydra_decorator(decorated_task)
 
@@ -462,37 +468,68 @@ def _get_configs(log_dir):
     return configs
 
 
-def _main_job_command(executable, current_file_path, work_dir, parent_log_dir, job_id):
-    exec_file = os.path.relpath(current_file_path, os.getcwd())
+def _submit_pending_jobs():
+    # Jobs are submitted once hydra has created all of them. The metadata of each job
+    # are then written once, when its scheduler information is known.
+    if not _pending_jobs:
+        return
+    jobs = list(_pending_jobs)
+    _pending_jobs.clear()
+
+    # The array job is submitted with the options of the first scheduler: jobs are
+    # submitted individually unless all of them share these options.
+    scheduler = jobs[0][0]
+    array_options = _get_array_options(scheduler)
+    if scheduler.array_jobs and all(_get_array_options(job[0]) == array_options for job in jobs):
+        scheduler.submit_array_job([logger.log_dir for _, _, logger, _, _ in jobs])
+        scheduler_info = scheduler.get_info()
+        for array_index, (_, _, logger, config, info_cfg) in enumerate(jobs, scheduler.array_first_index):
+            _log_submitted_job(logger, config, info_cfg, {**scheduler_info, "array_index": array_index})
+    else:
+        for scheduler, job_path, logger, config, info_cfg in jobs:
+            scheduler.submit_job_script(job_path)
+            _log_submitted_job(logger, config, info_cfg, scheduler.get_info())
+
+
+# Submit the jobs created before an error interrupted the sweep.
+atexit.register(_submit_pending_jobs)
 
-    args = _get_overrides()
-    values = [
-        f"cd {work_dir}",
-        f"{executable} {exec_file} {args} \
-            +mlxp.logger.forced_log_id={job_id}\
-            +mlxp.logger.parent_log_dir={parent_log_dir} \
-            +mlxp.use_scheduler={False}\
-            +mlxp.use_version_manager={False}\
-            +mlxp.interactive_mode={False}",
-    ]
 
-    values = [f"{val}\n" for val in values]
-    return "".join(values)
+def _get_array_options(scheduler):
+    option_cmd = list(scheduler.option_cmd) if scheduler.option_cmd else []
+    return type(scheduler).__name__, scheduler.shell_path, option_cmd, scheduler.array_jobs
+
+
+def _log_submitted_job(logger, config, info_cfg, scheduler_info):
+    OmegaConf.update(info_cfg, "info", {"scheduler": scheduler_info}, merge=True)
+    logger._log_configs(config, "config_unresolved", resolve=False)
+    logger._log_configs(info_cfg.info, "info")
+
+
+def _get_logger_kwargs(logger_class, logger_cfg):
+    # Custom loggers written before flush_every was added may not accept it: it is
+    # only passed to loggers whose constructor has a flush_every or **kwargs argument.
+    logger_kwargs = dict(logger_cfg)
+    parameters = inspect.signature(logger_class).parameters
+    accepts_kwargs = any(param.kind == param.VAR_KEYWORD for param in parameters.values())
+    if "flush_every" not in parameters and not accepts_kwargs:
+        logger_kwargs.pop("flush_every", None)
+    return logger_kwargs
 
 
 def _get_overrides():
+    from hydra.core.hydra_config import HydraConfig
+
     hydra_cfg = HydraConfig.get()
-    overrides = hydra_cfg.overrides.task
-
-    def filter_fn(config_dict):
-        return (
-            ("version_manager" not in config_dict)
-            and ("scheduler" not in config_dict)
-            and ("logger.parent_log_dir" not in config_dict)
-            and ("logger.forced_log_id" not in config_dict)
-            and ("interactive_mode" not in config_dict)
-        )
+    return _filter_overrides(hydra_cfg.overrides.task)
+
+
+_MLXP_OVERRIDES_PATTERN = re.compile(
+    r"version_manager|scheduler|logger\.parent_log_dir|logger\.forced_log_id|interactive_mode"
+)
+
 
-    filtered_args = list(filter(filter_fn, overrides))
+def _filter_overrides(overrides):
+    filtered_args = [override for override in overrides if not _MLXP_OVERRIDES_PATTERN.search(override)]
     args = " ".join(filtered_args)
     return args
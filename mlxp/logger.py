@@ -6,8 +6,8 @@ import json
 import marshal
 import os
 import random
-import shutil
 import sys
+import weakref
 from time import sleep
 from typing import Any, Callable, Dict, Union
 
@@ -18,8 +18,17 @@ from mlxp.data_structures.artifacts import Artifact_types
 from mlxp.enumerations import Directories
 from mlxp.errors import InvalidArtifactError, InvalidKeyError
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 invalid_metrics_file_names = ["info", "config", "mlxp", "artifacts"]
 
+# Use the C implementation of yaml when available.
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 
 class Logger(abc.ABC):
     """A logger that allows saving outputs of the run in a uniquely assigned directory
@@ -48,7 +57,7 @@ class Logger(abc.ABC):
         The parent directory where the directory of the run is created.
     """
 
-    def __init__(self, parent_log_dir, forced_log_id=-1, log_streams_to_file=False):
+    def __init__(self, parent_log_dir, forced_log_id=-1, log_streams_to_file=False, flush_every=1):
         """Create a logger object.
 
         :param parent_log_dir: The parent directory where the directory of the run is
@@ -58,37 +67,72 @@ class Logger(abc.ABC):
             negative, then the logger assigns a new unique log_id for the run.
         :param log_streams_to_file: When true, the stdout and stderr files are saved in
             files 'log_dir/log.stdout' and 'log_dir/log.stderr'.
+        :param flush_every: Number of lines logged by log_metrics to a same file before
+            writing them to disk, together with the new keys of the logged dictionaries.
+            Remaining lines are written when calling flush and when the logger is deleted.
         :type parent_log_dir: str
         :type forced_log_id: int
         :type log_streams_to_file: bool
+        :type flush_every: int
         """
         self.parent_log_dir = os.path.abspath(parent_log_dir)
         self.forced_log_id = forced_log_id
         self._metric_dict_keys = {}
+        self.flush_every = flush_every
+        self._metric_files = {}
+        self._metric_buffers = {}
+        self._pending_metric_keys = {}
+        self._created_dirs = set()
         self._artifact_types = Artifact_types
         self._log_id, self._log_dir = _make_log_dir(forced_log_id, self.parent_log_dir)
 
         self.metrics_dir = os.path.join(self._log_dir, Directories.Metrics.value)
         self.artifacts_dir = os.path.join(self._log_dir, Directories.Artifacts.value)
         self.metadata_dir = os.path.join(self._log_dir, Directories.Metadata.value)
+        self.metrics_keys_dir = os.path.join(self.metrics_dir, ".keys")
+        # Prefix of the metrics files paths, ending with a separator.
+        self._metrics_prefix = os.path.join(self.metrics_dir, "")
         self.session_dir = os.path.join(
             self._log_dir, Directories.Artifacts.value, Directories.Sessions.value
         )
-        os.makedirs(self.metrics_dir, exist_ok=True)
-        os.makedirs(self.artifacts_dir, exist_ok=True)
-        os.makedirs(self.metadata_dir, exist_ok=True)
+        # The log directory exists already: a single scan finds which of its
+        # subdirectories must be created.
+        with os.scandir(self._log_dir) as entries:
+            existing_dirs = {entry.name for entry in entries}
+        for directory in (self.metrics_dir, self.artifacts_dir, self.metadata_dir):
+            if os.path.basename(directory) not in existing_dirs:
+                try:
+                    os.mkdir(directory)
+                except FileExistsError:  # Created by another job using the same log_id
+                    pass
+            self._created_dirs.add(directory)
+        weakref.finalize(
+            self,
+            _close_files,
+            self._metric_files,
+            self._metric_buffers,
+            self.metrics_keys_dir,
+            self._pending_metric_keys,
+        )
 
         if log_streams_to_file:
-            log_stdout = open(os.path.join(self._log_dir, "log.stdout"), "w", buffering=1)
-            sys.stdout = log_stdout
-            log_stderr = open(os.path.join(self._log_dir, "log.stderr"), "w", buffering=1)
-            sys.stderr = log_stderr
+            sys.stdout = _redirect_stream(sys.stdout, 1, os.path.join(self._log_dir, "log.stdout"))
+            sys.stderr = _redirect_stream(sys.stderr, 2, os.path.join(self._log_dir, "log.stderr"))
 
     def _log_configs(self, config: DictConfig, name: str = "config", resolve: bool = True) -> None:
         file_name = os.path.join(self.metadata_dir, name)
-        with open(file_name + ".yaml", "w") as f:
-            OmegaConf.save(config=config, f=f, resolve=resolve)
-            # yaml.dump(config, f)
+        # Same output as OmegaConf.save, but emitted by the libyaml dumper when available.
+        container = OmegaConf.to_container(config, resolve=resolve, enum_to_str=True)
+        try:
+            content = yaml.dump(
+                container, Dumper=_YamlDumper, sort_keys=False, allow_unicode=True, default_flow_style=False
+            )
+        except yaml.representer.RepresenterError:  # e.g. pathlib.Path values
+            content = OmegaConf.to_yaml(config, resolve=resolve)
+        # Written at once then renamed, so that readers never see a partial file.
+        with open(file_name + ".yaml.tmp", "w") as f:
+            f.write(content)
+        os.replace(file_name + ".yaml.tmp", file_name + ".yaml")
 
     def get_info(self) -> None:
         """Return a dictionary containing information about the logger settings used for
@@ -129,13 +173,44 @@ class Logger(abc.ABC):
             )
 
         self._log_metrics_key(metrics_dict, log_name)
-        file_name = os.path.join(self.metrics_dir, log_name)
-        return self._log_metrics(metrics_dict, file_name)
+        file_name = self._metrics_prefix + log_name
+        self._log_metrics(metrics_dict, file_name)
+        if log_name in self._pending_metric_keys and not self._metric_buffers.get(file_name):
+            # New keys are written only once the lines containing them are on disk:
+            # the keys of other log names wait for their own lines.
+            _write_keys(self.metrics_keys_dir, {log_name: self._pending_metric_keys.pop(log_name)})
+
+    def flush(self) -> None:
+        """Write to disk all metrics that were logged using log_metrics and are not
+        saved yet.
+
+        :return: None
+        """
+        for file_name, buffer in self._metric_buffers.items():
+            _write_lines(self._metric_files[file_name], buffer)
+        _write_keys(self.metrics_keys_dir, self._pending_metric_keys)
+
+    def close(self) -> None:
+        """Write to disk all metrics that are not saved yet and close the metrics
+        files.
+
+        The files are opened again if log_metrics is called afterwards.
+
+        :return: None
+        """
+        _close_files(self._metric_files, self._metric_buffers, self.metrics_keys_dir, self._pending_metric_keys)
 
     def _log_metrics(self, metrics_dict: Dict[str, Union[int, float, str]], file_name: str) -> None:
-        with open(file_name + ".json", "a") as f:
-            json.dump(metrics_dict, f)
-            f.write(os.linesep)
+        # The metrics file is kept open across calls. Lines are written by batches of
+        # flush_every lines (each line by default), so that the file can be read
+        # while the run is still going.
+        buffer = self._metric_buffers.get(file_name)
+        if buffer is None:
+            self._metric_files[file_name] = open(file_name + ".json", "ab")
+            buffer = self._metric_buffers[file_name] = []
+        buffer.append(_dumps_metrics(metrics_dict))
+        if len(buffer) >= self.flush_every:
+            _write_lines(self._metric_files[file_name], buffer)
 
     def log_artifacts(self, artifact: object, artifact_name: str, artifact_type: str) -> None:
         """Save an artifact object into a destination file: 'log_dir/artifacts/artifact_name',
@@ -160,14 +235,16 @@ class Logger(abc.ABC):
             message += "To add a new artifact type, use the method register_artifact_type before calling this method."
             raise InvalidArtifactError(message)
         subdir = os.path.join(self.artifacts_dir, artifact_type, os.path.dirname(artifact_name))
-        os.makedirs(subdir, exist_ok=True)
+        self._makedirs(subdir)
         fname = os.path.join(self.artifacts_dir, artifact_type, artifact_name)
         fname_tmp = fname + "_tmp"
         trials = 10
         while trials>0:
             try:
                 self._artifact_types[artifact_type]["save"](artifact, fname_tmp)
-                shutil.move(fname_tmp, fname)
+                # Renames the file in place: unlike shutil.move, never falls back to
+                # copying the data when the destination already exists.
+                os.replace(fname_tmp, fname)
                 break
             except (FileNotFoundError, OSError) as e:
                 trials-=1
@@ -242,7 +319,7 @@ class Logger(abc.ABC):
 
             artifact_type_serialized = {name: {"load": code_string_load, "save": code_string_save}}
             artifact_type_file = os.path.join(self.artifacts_dir, ".keys")
-            os.makedirs(artifact_type_file, exist_ok=True)
+            self._makedirs(artifact_type_file)
             artifact_type_file = os.path.join(artifact_type_file, "custom_types.yaml")
             cur_yaml = {}
             try:
@@ -258,7 +335,7 @@ class Logger(abc.ABC):
         # Logging new keys appearing in a metrics dict
 
         artifact_keys_dir = os.path.join(self.artifacts_dir, ".keys")
-        os.makedirs(artifact_keys_dir, exist_ok=True)
+        self._makedirs(artifact_keys_dir)
         artifact_dict_name = os.path.join(artifact_keys_dir, "artifacts.yaml")
         cur_yaml = {}
         try:
@@ -279,6 +356,13 @@ class Logger(abc.ABC):
         with open(artifact_dict_name, "w") as f:
             yaml.dump(cur_yaml, f)
 
+    def _makedirs(self, path: str) -> None:
+        # Directories created by this logger are remembered to avoid repeating
+        # the filesystem lookups of os.makedirs when saving many files in them.
+        if path not in self._created_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._created_dirs.add(path)
+
     @property
     def log_id(self):
         """Return the uniquely assigned id of the run.
@@ -303,34 +387,30 @@ class Logger(abc.ABC):
 
     def _log_metrics_key(self, metrics_dict: Dict[str, Union[int, float, str]], log_name: str):
         # Logging new keys appearing in a metrics dict
+        logged_keys = self._metric_dict_keys.get(log_name)
+        if logged_keys is None:
+            # Keys logged by a previous session of a resumed run are read only once.
+            logged_keys = _load_keys_file(self._metrics_keys_file(log_name))
+            self._metric_dict_keys[log_name] = logged_keys
 
-        if log_name not in self._metric_dict_keys.keys():
-            self._metric_dict_keys[log_name] = []
-
-        new_keys = [key for key in metrics_dict.keys() if key not in self._metric_dict_keys[log_name]]
-
+        new_keys = metrics_dict.keys() - logged_keys.keys()
         if new_keys:
-            self._metric_dict_keys[log_name] += new_keys
-            dict_file = {key: "" for key in new_keys}
-            keys_dir = os.path.join(self.metrics_dir, ".keys")
-            os.makedirs(keys_dir, exist_ok=True)
-            log_name = os.path.join(keys_dir, log_name)
-            cur_yaml = {}
-            try:
-                with open(log_name + ".yaml", "r") as f:
-                    cur_yaml = yaml.safe_load(f)
-            except BaseException:
-                pass
-            cur_yaml.update(dict_file)
-            with open(log_name + ".yaml", "w") as f:
-                yaml.dump(cur_yaml, f)
+            new_keys = {key: "" for key in new_keys}
+            logged_keys.update(new_keys)
+            # The new keys are written to disk with the metrics lines (see _write_keys).
+            self._pending_metric_keys.setdefault(log_name, {}).update(new_keys)
+
+    def _metrics_keys_file(self, log_name: str) -> str:
+        return os.path.join(self.metrics_keys_dir, log_name + ".yaml")
 
 
 class DefaultLogger(Logger):
     """A logger that provides methods for logging checkpoints and loading them."""
 
-    def __init__(self, parent_log_dir, forced_log_id, log_streams_to_file=False):
-        super().__init__(parent_log_dir, forced_log_id, log_streams_to_file=log_streams_to_file)
+    def __init__(self, parent_log_dir, forced_log_id, log_streams_to_file=False, flush_every=1):
+        super().__init__(
+            parent_log_dir, forced_log_id, log_streams_to_file=log_streams_to_file, flush_every=flush_every
+        )
 
     def log_checkpoint(self, checkpoint: Any, log_name: str = "checkpoint") -> None:
         """Save a checkpoint for later use, this can be any serializable object.
@@ -370,35 +450,110 @@ class DefaultLogger(Logger):
 
 def _make_log_dir(forced_log_id, root):
     os.makedirs(root, exist_ok=True)
-    log_dir = None
     if forced_log_id < 0:
+        _id = _maximum_existing_log_id(root)
         fail_count = 0
-        while log_dir is None:
+        while True:
+            _id += 1
+            log_dir = os.path.join(root, str(_id))
             try:
-                _id = _maximum_existing_log_id(root) + 1
-                log_dir_tmp = os.path.join(root, str(_id))
-                os.mkdir(log_dir_tmp)
-                log_dir = log_dir_tmp  # set log_dir only if successful creation
+                os.mkdir(log_dir)
+                break
             except FileExistsError:  # Catch race conditions
-                sleep(random.random())
+                # Another job took this id: try the next one. Only rescan the
+                # directory, after a random delay, when collisions keep happening.
                 if fail_count < 1000:
                     fail_count += 1
                 else:  # expect that something else went wrong
                     raise
+                if fail_count % 10 == 0:
+                    sleep(random.random())
+                    _id = _maximum_existing_log_id(root)
     else:
         assert isinstance(forced_log_id, int)
         _id = forced_log_id
         log_dir = os.path.join(root, str(_id))
-        os.makedirs(log_dir, exist_ok=True)
+        try:
+            os.mkdir(log_dir)
+        except FileExistsError:  # Resumed run
+            pass
     return _id, log_dir
 
 
 def _maximum_existing_log_id(root):
-    dir_nrs = [int(d) for d in os.listdir(root) if os.path.isdir(os.path.join(root, d)) and d.isdigit()]
-    if dir_nrs:
-        return max(dir_nrs)
-    else:
-        return 0
+    with os.scandir(root) as entries:
+        return max((int(entry.name) for entry in entries if entry.name.isdigit() and entry.is_dir()), default=0)
+
+
+def _dumps_metrics(metrics_dict):
+    # Returns the json line of a metrics dict, including its line break.
+    if orjson is not None:
+        try:
+            line = orjson.dumps(
+                metrics_dict, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY
+            )
+        except TypeError:  # e.g. non-str keys or subclasses of builtin types
+            pass
+        else:
+            # orjson writes non-finite floats as null: json is used in that case
+            # to keep NaN and Infinity values readable. Searching the output is
+            # cheaper than inspecting every value of the dict.
+            if b"null" not in line:
+                return line
+    return json.dumps(metrics_dict, default=_to_json_builtin).encode() + b"\n"
+
+
+def _to_json_builtin(obj):
+    # Numpy scalars and arrays are converted to python numbers and lists.
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _write_lines(f, buffer):
+    if buffer:
+        f.write(b"".join(buffer))
+        f.flush()
+        buffer.clear()
+
+
+def _write_keys(keys_dir, pending_keys):
+    # Each key is a line of a yaml mapping: new keys are appended to the keys file
+    # of their log name instead of dumping all keys again.
+    if pending_keys:
+        os.makedirs(keys_dir, exist_ok=True)
+        for log_name, new_keys in pending_keys.items():
+            with open(os.path.join(keys_dir, log_name + ".yaml"), "a") as f:
+                yaml.dump(new_keys, f, Dumper=_YamlDumper)
+        pending_keys.clear()
+
+
+def _close_files(files, buffers, keys_dir, pending_keys):
+    for file_name, f in files.items():
+        _write_lines(f, buffers[file_name])
+        f.close()
+    files.clear()
+    buffers.clear()
+    _write_keys(keys_dir, pending_keys)
+
+
+def _redirect_stream(stream, fd, file_name):
+    # The file descriptor itself is redirected to the file, so that outputs of
+    # C extensions and subprocesses are also saved. The python stream writing to it
+    # is line buffered: lines are not lost if the job is killed by the scheduler.
+    stream.flush()
+    file_fd = os.open(file_name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    os.dup2(file_fd, fd)
+    os.close(file_fd)
+    return open(fd, "w", buffering=1, closefd=False)
+
+
+def _load_keys_file(keys_file):
+    try:
+        with open(keys_file, "r") as f:
+            return yaml.load(f, Loader=_YamlLoader) or {}
+    except FileNotFoundError:
+        return {}
 
 
 def _path_as_key(path):
@@ -2,6 +2,7 @@
 
 import abc
 import ast
+import functools
 from operator import eq, ge, gt, le, lt, ne
 
 from ply import lex
@@ -38,9 +39,14 @@ class DefaultParser(Parser):
     def __init__(self):
         self.lexer = _Lexer()
         self.parser = _YaccParser()
+        # Queries are immutable: a query string is only parsed once.
+        self._parse = functools.lru_cache(maxsize=256)(self._parse_query)
 
     def parse(self, query: str) -> QueryInstance:
         """Parse a query string into a tinydb QueryInstance object."""
+        return self._parse(query)
+
+    def _parse_query(self, query):
         return self.parser.parse(query, lexer=self.lexer)
 
 
@@ -211,6 +217,7 @@ def _not_op(expr):
     return ~expr
 
 
+@functools.lru_cache(maxsize=None)
 def _build_field_struct(key):
     field = Query()
     field = field[key]
@@ -1,6 +1,7 @@
 """The reader allows queryring the logs of several experiments and performing operations
 on the content of these logs (e.g. grouping and aggregation)."""
 
+import json
 import os
 from collections.abc import MutableMapping
 from typing import Optional, Union
@@ -15,6 +16,14 @@ from mlxp.data_structures.dataframe import LAZYARTIFACT, LAZYDATA, DataDict, Dat
 from mlxp.enumerations import DataFrameType, Directories
 from mlxp.parser import DefaultParser, Parser, _is_searchable
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Use the C implementation of yaml when available.
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class Reader:
     """A class for exploiting the results stored in several runs contained in a same
@@ -59,7 +68,8 @@ class Reader:
             runs.
         :param dst_dir: The destination directory where the database will be created.
         :param parser: A parser for querying the database.
-        :param refresh: Re-create the database even if it already exists.
+        :param refresh: Update the database even if it already exists. Only the runs
+            whose metadata files changed since the last update are read again.
         :type src_dir: str
         :type dst_dir: str (default None)
         :type parser: Parser (default DefaultParser)
@@ -75,13 +85,15 @@ class Reader:
 
         self.database = TinyDB(
             os.path.join(self.dst_dir, self.file_name + ".json"),
-            storage=JSONStorage,
+            storage=_JSONStorage,
             sort_keys=True,
             indent=4,
             separators=(",", ": "),
         )
-        self.runs = self.database.table("runs")
+        # TinyDB caches the results of the last queries, keyed by the query.
+        self.runs = self.database.table("runs", cache_size=128)
         self._fields = self.database.table("fields")
+        self._sources = self.database.table("sources")
 
         if not self.database.tables() or refresh:
             print("Creating a database file of the runs...")
@@ -129,7 +141,9 @@ class Reader:
             res = self.runs.search(query)
         else:
             res = self.runs.all()
-        res = [DataDict(r, parent_dir=_get_log_dir(r, self.src_dir)) for r in res]
+        # The documents are copied: they are shared with the query cache of TinyDB,
+        # and DataDict.update modifies its dictionary in place.
+        res = [DataDict(dict(r), parent_dir=_get_log_dir(r, self.src_dir)) for r in res]
         res = DataFrame(res)
         if result_format == DataFrameType.Pandas.value:
             return res.toPandas(lazy=False)
@@ -167,32 +181,61 @@ class Reader:
         return dataframe
 
     def _create_base(self):
+        # Runs whose metadata files are unchanged since the database was last
+        # created are not read again: their documents and fields are reused.
+        old_runs = {doc.doc_id: doc for doc in self.runs.all()}
+        old_sources = {doc.doc_id: doc for doc in self._sources.all()}
         self.database.drop_table("runs")
         self.database.drop_table("fields")
-        all_fields = {}
-        dir_nrs = [
-            int(d)
-            for d in os.listdir(self.src_dir)
-            if os.path.isdir(os.path.join(self.src_dir, d)) and d.isdigit()
-        ]
+        self.database.drop_table("sources")
+        # TinyDB rewrites the whole database file after each insertion: all
+        # documents are collected first and inserted at once in each table.
+        runs, sources, all_fields = [], [], {}
+        with os.scandir(self.src_dir) as entries:
+            dir_nrs = [int(entry.name) for entry in entries if entry.name.isdigit() and entry.is_dir()]
         files_not_found = []
         for file_id in dir_nrs:
             path = os.path.join(self.src_dir, str(file_id))
-            try:
-                data, fields = _get_data(path)
-                self.runs.insert(Document(data, doc_id=file_id))
-                all_fields.update(fields)
-            except FileNotFoundError:
-                files_not_found.append(path)
-
-        for key, value in all_fields.items():
-            self._fields.insert({key: value})
+            signature = _get_signature(path)
+            source = old_sources.get(file_id)
+            if source is not None and file_id in old_runs and source["signature"] == signature:
+                data, fields = old_runs[file_id], source["fields"]
+            else:
+                try:
+                    data, fields = _get_data(path)
+                except FileNotFoundError:
+                    files_not_found.append(path)
+                    continue
+            runs.append(Document(data, doc_id=file_id))
+            sources.append(Document({"signature": signature, "fields": fields}, doc_id=file_id))
+            all_fields.update(fields)
+
+        self.runs.insert_multiple(runs)
+        self._sources.insert_multiple(sources)
+        self._fields.insert_multiple({key: value} for key, value in all_fields.items())
 
         if files_not_found:
             print("Warning: The following files were not found:")
             print(files_not_found)
 
 
+class _JSONStorage(JSONStorage):
+    # TinyDB parses the whole database file each time a table is accessed: the
+    # file is read with orjson when available. Writing is left to json, which
+    # keeps the formatting options and non-finite floats.
+    def read(self):
+        if orjson is None:
+            return super().read()
+        self._handle.seek(0)
+        content = self._handle.read()
+        if not content:
+            return None
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:  # e.g. NaN values
+            return json.loads(content)
+
+
 def _get_metrics_dir(res_dict, src_dir):
     abs_metrics_dir = res_dict["info.logger.metrics_dir"]
     parent_log_dir = os.path.dirname(res_dict["info.logger.log_dir"])
@@ -212,7 +255,7 @@ def _get_data(path):
     for key in data:
         fname = os.path.join(path, Directories.Metadata.value, key + ".yaml")
         with open(fname, "r") as file:
-            data[key] = yaml.safe_load(file)
+            data[key] = yaml.load(file, Loader=_YamlLoader)
 
     metadata_dict = _flatten_dict(data, parent_key="")
 
@@ -228,6 +271,28 @@ def _get_data(path):
     return metadata_dict, fields
 
 
+def _get_signature(path):
+    # Modification times and sizes of all files read by _get_data.
+    files = [
+        os.path.join(path, Directories.Metadata.value, "config.yaml"),
+        os.path.join(path, Directories.Metadata.value, "info.yaml"),
+        os.path.join(path, Directories.Artifacts.value, ".keys", "artifacts.yaml"),
+    ]
+    keys_dir = os.path.join(path, Directories.Metrics.value, ".keys")
+    try:
+        files += sorted(os.path.join(keys_dir, name) for name in os.listdir(keys_dir) if name.endswith(".yaml"))
+    except FileNotFoundError:
+        pass
+    signature = []
+    for file_name in files:
+        try:
+            stat = os.stat(file_name)
+        except FileNotFoundError:
+            continue
+        signature.append([os.path.relpath(file_name, path), stat.st_mtime_ns, stat.st_size])
+    return signature
+
+
 def _get_metrics_data(path):
     keys_dir = os.path.join(path, Directories.Metrics.value, ".keys")
 
@@ -238,7 +303,7 @@ def _get_metrics_data(path):
                 prefix = os.path.splitext(file_name)[0]
                 full_file_name = os.path.join(keys_dir, file_name)
                 with open(full_file_name, "r") as file:
-                    keys_dict = yaml.safe_load(file)
+                    keys_dict = yaml.load(file, Loader=_YamlLoader)
                 if keys_dict:
                     lazydata_dict.update({prefix + "." + key: LAZYDATA for key in keys_dict.keys()})
     except FileNotFoundError:
@@ -252,7 +317,7 @@ def _get_artifacts_data(path):
     lazydata_dict = {}
     try:
         with open(artifacts_dict_name, "r") as file:
-            keys_dict = yaml.safe_load(file)
+            keys_dict = yaml.load(file, Loader=_YamlLoader)
         if keys_dict:
             for key, value in keys_dict.items():
 
@@ -4,7 +4,7 @@ import abc
 import os
 import platform
 import subprocess
-from copy import deepcopy
+from pathlib import Path
 from typing import Any, Dict, List
 
 from mlxp.errors import InvalidShellPathError, JobSubmissionError, UnknownSystemError
@@ -35,6 +35,9 @@ SLURM = {
     "job_name_cmd": "--job-name=",
     "output_file_cmd": "--output=",
     "error_file_cmd": "--error=",
+    "array_cmd": "--array={first}-{last}",
+    "array_index_var": "SLURM_ARRAY_TASK_ID",
+    "array_first_index": 0,
     "get_info": _get_info_null,
 }
 
@@ -45,6 +48,9 @@ OAR = {
     "job_name_cmd": "-n ",
     "output_file_cmd": "-O ",
     "error_file_cmd": "-E ",
+    "array_cmd": "--array {num_jobs}",
+    "array_index_var": "OAR_ARRAY_INDEX",
+    "array_first_index": 1,
     "get_info": get_info_oar,
 }
 
@@ -67,6 +73,9 @@ SGE = {
     "job_name_cmd": "-N ",
     "output_file_cmd": "-o ",
     "error_file_cmd": "-e ",
+    "array_cmd": "-t {first}-{last}",
+    "array_index_var": "SGE_TASK_ID",
+    "array_first_index": 1,
     "get_info": _get_info_null,
 }
 
@@ -130,6 +139,13 @@ class _Scheduler(abc.ABC):
         :type: Any
 
         Path to the shell used for submitting a job using a scheduler. (default '/bin/bash')
+
+    .. py:attribute:: array_jobs
+        :type: bool
+
+        If true, the jobs of a sweep are submitted together as a single array job
+        instead of one submission per job. Only used by schedulers supporting
+        array jobs (SLURM, OAR and SGE). (default False)
     """
 
     def __init__(self, specs: Dict[str, Any]):
@@ -164,6 +180,13 @@ class _Scheduler(abc.ABC):
         self.env_cmd = specs['env_cmd']
         self.post_cmd = specs['post_cmd']
         self.before_cmd= specs['before_cmd']
+        self.array_cmd = specs.get('array_cmd')
+        self.array_index_var = specs.get('array_index_var')
+        self.array_first_index = specs.get('array_first_index', 0)
+        self.array_jobs = specs.get('array_jobs', False)
+        if self.array_jobs and not self.array_cmd:
+            print(f"{specs['directive']} does not support array jobs, submitting jobs individually.")
+            self.array_jobs = False
 
         self.process_output = None
 
@@ -212,13 +235,67 @@ class _Scheduler(abc.ABC):
         :type log_dir: str
         :raises JobSubmissionError: if the scheduler failed to submit the job.
         """
+        job_path = self.save_job_script(main_cmd, log_dir)
+        self.submit_job_script(job_path)
+
+    def save_job_script(self, main_cmd, log_dir) -> str:
+        """Save the script of a job in its log directory without submitting it.
+
+        :param main_cmd: A string of the main bash command to be executed.
+        :param log_dir: The log directory where the main script will be saved.
+        :type main_cmd: str
+        :type log_dir: str
+        :return: The path to the saved script.
+        :rtype: str
+        """
         cmd = self._make_job(main_cmd, log_dir)
         print(cmd)
 
-        job_path = job_path = os.path.join(log_dir, _get_script_name())
-        with open(job_path, "w") as file:
-            file.write(cmd)
+        job_path = os.path.join(log_dir, _get_script_name())
+        _write_script(job_path, cmd)
+        return job_path
+
+    def submit_array_job(self, log_dirs: List[str]) -> None:
+        """Submit the jobs whose scripts were saved in the directories log_dirs as a
+        single array job.
+
+        Each task of the array executes the script of one job and redirects its outputs
+        to the files log.stdout and log.stderr of that job.
+        The array script is saved in a directory 'array_<first_log_id>-<last_log_id>'
+        next to the log directories of the jobs.
+
+        :param log_dirs: The log directories of the jobs, in the order of their array index.
+        :type log_dirs: List[str]
+        :raises JobSubmissionError: if the scheduler failed to submit the job.
+        """
+        first = self.array_first_index
+        last = first + len(log_dirs) - 1
+        cases = []
+        for index, log_dir in enumerate(log_dirs, first):
+            job_path = os.path.join(log_dir, _get_script_name())
+            out_path = os.path.join(log_dir, "log.stdout")
+            err_path = os.path.join(log_dir, "log.stderr")
+            cases.append(f"    {index}) {self.shell_path} {job_path!r} > {out_path!r} 2> {err_path!r} ;;\n")
+        main_cmd = f'case "${self.array_index_var}" in\n' + "".join(cases) + "esac\n"
+
+        array_name = f"array_{os.path.basename(log_dirs[0])}-{os.path.basename(log_dirs[-1])}"
+        array_dir = os.path.join(os.path.dirname(log_dirs[0]), array_name)
+        os.makedirs(array_dir, exist_ok=True)
+        array_cmd = self.array_cmd.format(first=first, last=last, num_jobs=len(log_dirs))
+        cmd = self._make_job(main_cmd, array_dir, extra_options=[array_cmd], with_env=False)
+        print(cmd)
+
+        job_path = os.path.join(array_dir, _get_script_name())
+        _write_script(job_path, cmd)
+        self.submit_job_script(job_path)
 
+    def submit_job_script(self, job_path: str) -> None:
+        """Submit a job script previously saved with save_job_script.
+
+        :param job_path: The path to the script of the job.
+        :type job_path: str
+        :raises JobSubmissionError: if the scheduler failed to submit the job.
+        """
         try:
             chmod_cmd = _cmd_make_executable(job_path)
             subprocess.check_call(chmod_cmd, shell=True)
@@ -240,51 +317,34 @@ class _Scheduler(abc.ABC):
         raise UnknownSystemError()
 
     def _main_job_command(self, executable, exec_file, work_dir, parent_log_dir, job_id, args):
-
-        values = [
-            f"cd {work_dir}",
-            f"{self.before_cmd} {executable} {exec_file} {args} \
-                +mlxp.logger.forced_log_id={job_id}\
-                +mlxp.logger.parent_log_dir={parent_log_dir} \
-                +mlxp.use_scheduler={False}\
-                +mlxp.use_version_manager={False}\
-                +mlxp.interactive_mode={False}",
-        ]
-
-        values = [f"{val}\n" for val in values]
-        return "".join(values)
-
-
-    def _make_job(self, main_cmd, log_dir):
-        job_command = [main_cmd]
-
+        return (
+            f"cd {work_dir}\n"
+            f"{self.before_cmd} {executable} {exec_file} {args} "
+            f"+mlxp.logger.forced_log_id={job_id} "
+            f"+mlxp.logger.parent_log_dir={parent_log_dir} "
+            f"+mlxp.use_scheduler=False "
+            f"+mlxp.use_version_manager=False "
+            f"+mlxp.interactive_mode=False\n"
+        )
+
+    def _make_job(self, main_cmd, log_dir, extra_options=None, with_env=True):
         # Setting shell
         if not self.shell_path:
             raise InvalidShellPathError()
-        shell_cmd = [self._cmd_shell_path()]
 
         # Setting scheduler options
-
         option_cmd = self.make_job_details(log_dir)
         if self.option_cmd:
             option_cmd += self.option_cmd
-        option_cmd = [f"{self.directive} {val}\n" for val in option_cmd]
-        option_cmd = ["".join(option_cmd)]
+        if extra_options:
+            option_cmd += extra_options
+        directives = "".join(f"{self.directive} {val}\n" for val in option_cmd)
 
         # Setting environment
-        if len(self.env_cmd)>0:
-            env_cmds = [f"{cmd}\n" for cmd in self.env_cmd]
-        else:
-            env_cmds = [f"\n"]
-
-        if len(self.post_cmd)>0:
-            post_cmd = [f"{cmd}\n" for cmd in self.post_cmd]
-        else:
-            post_cmd = [f"\n"]
-
-        cmd = "".join(shell_cmd + option_cmd + env_cmds + job_command + post_cmd)
-        return cmd
+        env_cmds = "".join(f"{cmd}\n" for cmd in self.env_cmd) if with_env and self.env_cmd else "\n"
+        post_cmd = "".join(f"{cmd}\n" for cmd in self.post_cmd) if with_env and self.post_cmd else "\n"
 
+        return f"{self._cmd_shell_path()}{directives}{env_cmds}{main_cmd}{post_cmd}"
 
 
 def _get_script_name():
@@ -295,6 +355,17 @@ def _get_script_name():
         return "script.bat"
     raise UnknownSystemError()
 
+def _write_script(job_path, cmd):
+    content = cmd.encode("utf-8")
+    path = Path(job_path)
+    # Resubmitting a job leaves an identical script: avoid rewriting it on shared file systems.
+    try:
+        if path.stat().st_size == len(content) and path.read_bytes() == content:
+            return
+    except FileNotFoundError:
+        pass
+    path.write_bytes(content)
+
 def _cmd_make_executable(script):
     system = platform.system()
     if system in ["Linux", "Darwin"]:
@@ -304,14 +375,14 @@ def _cmd_make_executable(script):
     raise UnknownSystemError()
 
 def _create_scheduler(scheduler_spec):
-    specs = deepcopy(scheduler_spec)
+    specs = dict(scheduler_spec)
     class_name = specs.pop("name")
     info_method = specs.pop("get_info")
 
     class _ChildScheduler(_Scheduler):
-        def __init__(self, shell_path="/bin/bash", env_cmd="", post_cmd="", before_cmd="", option_cmd=None):
+        def __init__(self, shell_path="/bin/bash", env_cmd="", post_cmd="", before_cmd="", option_cmd=None, array_jobs=False):
             specs.update(
-                {"shell_path": shell_path, "env_cmd": env_cmd, "post_cmd":post_cmd, "before_cmd":before_cmd, "option_cmd": option_cmd,}
+                {"shell_path": shell_path, "env_cmd": env_cmd, "post_cmd":post_cmd, "before_cmd":before_cmd, "option_cmd": option_cmd, "array_jobs": array_jobs,}
             )
 
             super().__init__(specs)
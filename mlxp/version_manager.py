@@ -3,10 +3,13 @@ generate a deployment version of the code based on the latest git commit."""
 
 import abc
 import os
+import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict
 
 from mlxp._internal._interactive_mode import _bcolors, _printc
+from mlxp.errors import InvalidGitRepositoryError
 
 IGNORE_UNTRACKED_MSG = _bcolors.FAIL + "Warning:" + _bcolors.ENDC + "There are untracked files! \n"
 IGNORE_UNTRACKED_MSG += (
@@ -90,6 +93,7 @@ class GitVM(VersionManager):
         self.dst = None
         self.commit_hash = None
         self.repo_path = None
+        self._status = None
         self.work_dir = os.getcwd()
         self.requirements = ["UNKNOWN"]
 
@@ -122,42 +126,70 @@ class GitVM(VersionManager):
         :rtype: str
         :return: A path to the target working directory
         """
-        repo = _get_git_repo()
-        repo_root = repo.git.rev_parse("--show-toplevel")
-        relpath = os.path.relpath(os.getcwd(), repo_root)
-        self.repo_path = repo.working_tree_dir
-        self._handle_untracked_files(repo)
-        self._handle_commit_state(repo)
-        self._handle_cloning(repo, relpath)
+        if self._existing_choices:
+            # Choices were already made for this sweep: HEAD cannot change anymore,
+            # so an existing backup can be reused without inspecting the repository.
+            work_dir = self._get_existing_work_dir()
+            if work_dir is not None:
+                return work_dir
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # The status of the repository is collected while its root and HEAD are
+            # resolved: both git calls are independent.
+            status = executor.submit(_get_status, os.getcwd())
+            self.repo_path, self.commit_hash = _get_repo_root_and_head()
+            self._status = status.result()
+        relpath = os.path.relpath(os.getcwd(), self.repo_path)
+        self._handle_untracked_files()
+        self._handle_commit_state()
+        self._handle_cloning(relpath)
 
         if not self._existing_choices:
             self.im_handler.save_im_choice()
 
         return self.work_dir
 
-    def _clone_repo(self, repo):
+    def _get_existing_work_dir(self):
+        try:
+            repo_root, commit_hash = _get_repo_root_and_head()
+        except InvalidGitRepositoryError:
+            return None
+
+        dst = os.path.join(self.parent_work_dir, os.path.basename(repo_root), commit_hash)
+        if not _is_non_empty_dir(dst):
+            return None
+
+        self.repo_path = repo_root
+        self.commit_hash = commit_hash
+        self.dst = dst
+        self._set_requirements()
+        self.work_dir = os.path.join(self.dst, os.path.relpath(os.getcwd(), repo_root))
+        return self.work_dir
+
+    def _clone_repo(self):
         repo_name = self.repo_path.split("/")[-1]
-        self.commit_hash = repo.head.object.hexsha
         target_name = os.path.join(repo_name, self.commit_hash)
         parent_work_dir = self.parent_work_dir
         self.dst = os.path.join(parent_work_dir, target_name)
 
         if not os.path.isdir(self.dst):
             _printc(_bcolors.OKBLUE, f"Creating a backup of the code at {self.dst}")
-            repo.clone(self.dst)
+            _add_worktree(self.repo_path, self.dst, self.commit_hash)
             if self.compute_requirements:
                 self._make_requirements_file()
+            else:
+                self._set_requirements()
         else:
             if not self._existing_choices:
                 _printc(
                     _bcolors.OKBLUE, f"Found a backup of the code with commit-hash: {self.commit_hash}",
                 )
                 _printc(_bcolors.OKBLUE, f"Run will be executed from {self.dst}")
+            self._set_requirements()
 
-    def _handle_cloning(self, repo, relpath):
+    def _handle_cloning(self, relpath):
 
-        self._clone_repo(repo)
-        self._set_requirements()
+        self._clone_repo()
         self.work_dir = os.path.join(self.dst, relpath)
         if not self._existing_choices:
             _printc(
@@ -169,111 +201,195 @@ class GitVM(VersionManager):
                 _bcolors.FAIL, msg,
             )
 
-    def _handle_commit_state(self, repo):
+    def _handle_commit_state(self):
+        if self._existing_choices:
+            return
+        if self._status is None:
+            self._status = _get_status(self.repo_path)
+        _, changed_files = self._status
         while True:
             done = True
 
-            if not self._existing_choices:
-                if repo.is_dirty():
-                    _printc(_bcolors.OKBLUE, "There are uncommitted changes in the repository:\n")
-                    _disp_uncommited_files(repo)
-                    if self.im_handler.interactive_mode:
-                        done = _is_done_uncommited_changes(repo)
-                else:
-                    _printc(_bcolors.OKBLUE, "No uncommitted changes!")
+            if changed_files:
+                _printc(_bcolors.OKBLUE, "There are uncommitted changes in the repository:\n")
+                _disp_uncommited_files(changed_files)
+                if self.im_handler.interactive_mode:
+                    done, changed_files = _is_done_uncommited_changes(self.repo_path, changed_files)
+                    if not changed_files:
+                        # The changes were committed: HEAD moved to the new commit.
+                        self.commit_hash = _git("rev-parse", "HEAD", cwd=self.repo_path)
+            else:
+                _printc(_bcolors.OKBLUE, "No uncommitted changes!")
 
             if done:
-                if repo.is_dirty() and not self._existing_choices:
+                if changed_files:
                     print(IGNORE_UNCOMMITED_MSG)
                 break
 
-    def _handle_untracked_files(self, repo):
+    def _handle_untracked_files(self):
+        if self._existing_choices:
+            return
+        untracked_files, _ = self._status
         while True:
             done = True
-            if not self._existing_choices:
-                if repo.untracked_files:
-                    _printc(_bcolors.OKGREEN, "There are untracked files in the repository:")
-                    _disp_untracked_files(repo)
-                    if self.im_handler.interactive_mode:
-                        done = _is_done_untracked_files(repo)
-                else:
-                    _printc(_bcolors.OKBLUE, "No untracked files!")
-                    _printc(_bcolors.OKBLUE, "Continuing checks ...")
+            if untracked_files:
+                _printc(_bcolors.OKGREEN, "There are untracked files in the repository:")
+                _disp_untracked_files(untracked_files)
+                if self.im_handler.interactive_mode:
+                    done, untracked_files = _is_done_untracked_files(self.repo_path)
+                    # Newly tracked files are now uncommitted changes.
+                    self._status = None
+            else:
+                _printc(_bcolors.OKBLUE, "No untracked files!")
+                _printc(_bcolors.OKBLUE, "Continuing checks ...")
 
             if done:
-                if repo.untracked_files and not self._existing_choices:
+                if untracked_files:
                     print(IGNORE_UNTRACKED_MSG)
                 break
 
     def _make_requirements_file(self):
+        from pipreqs import pipreqs
+
         _printc(_bcolors.OKBLUE, "No requirements file found")
         _printc(_bcolors.OKBLUE, "Generating it using pipreqs")
-        # Create a new updated requirement file.
-        reqs_cmd = f"pipreqs --force {self.dst}"
-        subprocess.check_call(reqs_cmd, shell=True)
+        # Create a new updated requirement file, as done by 'pipreqs --force'.
+        # Packages only list their exports with pipreqs>=0.5, older versions
+        # match local packages by name.
+        candidates = pipreqs.get_pkg_names(pipreqs.get_all_imports(self.dst, encoding="utf-8"))
+        local = pipreqs.get_import_local(candidates, encoding="utf-8")
+        local_names = {
+            name
+            for package in local
+            for name in [package["name"].lower(), *package.get("exports", ())]
+        }
+        missing = [name for name in candidates if name.lower() not in local_names]
+        packages = local + pipreqs.get_imports_info(missing)
+        packages.sort(key=lambda package: package["name"].lower())
+        # The file is written atomically: its presence means the requirements of the
+        # backup are complete, so pipreqs never runs again for this backup.
+        fname = os.path.join(self.dst, "requirements.txt")
+        tmp_fname = f"{fname}.{os.getpid()}.tmp"
+        pipreqs.generate_requirements_file(tmp_fname, packages, "==")
+        os.replace(tmp_fname, fname)
+        # Keep the written requirements to avoid reading the file back.
+        self.requirements = [
+            f"{package['name']}=={package['version']}" if package["version"] else package["name"]
+            for package in packages
+        ]
 
     def _set_requirements(self):
         fname = os.path.join(self.dst, "requirements.txt")
+        try:
+            with open(fname, "r") as file:
+                self.requirements = file.read().splitlines()
+        except FileNotFoundError:
+            if self.compute_requirements:
+                self._make_requirements_file()
 
-        if os.path.exists(fname) or not self.compute_requirements:
-            pass
-        else:
-            self._make_requirements_file()
 
-        if os.path.exists(fname):
-            with open(fname, "r") as file:
-                # Read the contents of the file
-                contents = file.read()
-                # Split the contents into lines
-                lines = contents.splitlines()
-                # Create a list of package names
-                package_list = []
-                # Iterate through the lines and append each line (package name) to the
-                # list
-                for line in lines:
-                    package_list.append(line)
-            self.requirements = package_list
-
-
-def _disp_uncommited_files(repo):
-    unstaged_files = repo.index.diff(None)
-    staged_files = repo.index.diff("HEAD", staged=True)
-    all_files = unstaged_files + staged_files
-    for change in all_files:
-        file_name = change.a_path
+def _disp_uncommited_files(changed_files):
+    for file_name in changed_files:
         _printc(_bcolors.FAIL, file_name)
 
 
-def _disp_untracked_files(repo):
-    import git
-    from git.compat import defenc
-    status = repo.git.status(porcelain=True, untracked_files=False, as_process=True)
+def _disp_untracked_files(untracked_files):
+    for name in untracked_files:
+        print(name)
 
-    prefix = "?? "
+
+def _git(*args, cwd=None):
+    output = subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True)
+    return output.stdout.rstrip()
+
+
+def _get_status(repo_path):
+    # Returns the untracked files and the files with uncommitted changes
+    # using a single call to 'git status'. With -z, paths are neither quoted
+    # nor escaped, and the original path of a renamed file is a separate entry.
+    status = _git("status", "--porcelain=v1", "-z", "--untracked-files=all", cwd=repo_path)
     untracked_files = []
-    for line in status.stdout:
-        line = line.decode(defenc)
-        if not line.startswith(prefix):
+    changed_files = []
+    entries = iter(status.split("\0"))
+    for entry in entries:
+        if not entry:
             continue
-        filename = line[len(prefix) :].rstrip("\n")
-        if filename[0] == filename[-1] == '"':
-            filename = filename[1:-1]
-            filename = filename.encode("ascii").decode("unicode_escape").encode("latin1").decode(defenc)
-        untracked_files.append(filename)
+        file_name = entry[3:]
+        if entry.startswith("?? "):
+            untracked_files.append(file_name)
+        else:
+            changed_files.append(file_name)
+            # Renames and copies are reported in the index or in the worktree column.
+            if "R" in entry[:2] or "C" in entry[:2]:
+                next(entries, None)
+    return untracked_files, changed_files
+
+
+def _is_non_empty_dir(path):
+    return os.path.isdir(path) and bool(os.listdir(path))
+
+
+def _add_worktree(repo_path, dst, commit_hash):
+    # The backup is a detached worktree of a bare mirror of the repository, so that
+    # the repository itself is left untouched. It is checked out in a private
+    # directory and moved afterwards: jobs of a same sweep may try to create the
+    # same backup concurrently.
+    mirror_path = _get_mirror(repo_path, os.path.dirname(dst), commit_hash)
+    if _has_stale_worktrees(mirror_path):
+        _git("worktree", "prune", cwd=mirror_path)
+    tmp_dst = f"{dst}.tmp-{os.getpid()}"
+    _git("worktree", "add", "--detach", tmp_dst, commit_hash, cwd=mirror_path)
+    try:
+        os.rename(tmp_dst, dst)
+    except OSError:
+        _git("worktree", "remove", "--force", tmp_dst, cwd=mirror_path)
+        if not _is_non_empty_dir(dst):
+            raise
+    else:
+        # Point the administrative entry of the worktree to its new location.
+        _git("worktree", "repair", dst, cwd=mirror_path)
+
+
+def _get_mirror(repo_path, parent_dir, commit_hash):
+    # The objects of the repository are hardlinked (--local) rather than borrowed
+    # (--shared): a gc in the repository must not prune objects of the backups.
+    # Commits made after the mirror was created are fetched below.
+    mirror_path = os.path.join(parent_dir, ".mirror.git")
+    if not os.path.isdir(mirror_path):
+        os.makedirs(parent_dir, exist_ok=True)
+        tmp_path = f"{mirror_path}.tmp-{os.getpid()}"
+        _git("clone", "--bare", "--local", "--quiet", repo_path, tmp_path)
+        try:
+            os.rename(tmp_path, mirror_path)
+        except OSError:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            if not os.path.isdir(mirror_path):
+                raise
+    try:
+        _git("cat-file", "-e", f"{commit_hash}^{{commit}}", cwd=mirror_path)
+    except subprocess.CalledProcessError:
+        # The commit is newer than the mirror.
+        _git("fetch", "--quiet", repo_path, commit_hash, cwd=mirror_path)
+    return mirror_path
 
-    for name in untracked_files:
-        print(name)
 
+def _has_stale_worktrees(repo_path):
+    # Backups removed by hand leave administrative entries behind.
+    worktrees = _git("worktree", "list", "--porcelain", cwd=repo_path)
+    for line in worktrees.splitlines():
+        if line.startswith("worktree ") and not os.path.isdir(line[len("worktree ") :]):
+            return True
+    return False
 
-def _get_git_repo():
-    import git
+
+def _get_repo_root_and_head():
+    # The root of the repository and its latest commit are obtained with a single git call.
     try:
-        repo = git.Repo(search_parent_directories=True)
-    except git.exc.InvalidGitRepositoryError as error:
+        repo_root, commit_hash = _git("rev-parse", "--show-toplevel", "HEAD", cwd=os.getcwd()).splitlines()
+    except (OSError, subprocess.CalledProcessError, ValueError) as error:
         msg = os.getcwd() + ". To use the GitVM version manager, the code must belong to a git repository!"
-        raise git.exc.InvalidGitRepositoryError(msg) from error
-
-    return repo
+        raise InvalidGitRepositoryError(msg) from error
+    return repo_root, commit_hash
 
 
 def _get_cloning_choice():
@@ -287,40 +403,39 @@ def _get_cloning_choice():
     return choice
 
 
-def _is_done_uncommited_changes(repo):
+def _is_done_uncommited_changes(repo_path, changed_files):
     done = False
     choice = _get_choice_uncommited_changes()
-    if repo.is_dirty():
-        if choice == "y":
-            _printc(_bcolors.OKBLUE, "Commiting changes....")
-            output_msg = repo.git.commit("-a", "-m", "[mlxp]: Automatically committing all changes")
-            print(output_msg)
-            done = True
-        elif choice == "n":
-            done = True
-        else:
-            _printc(_bcolors.OKBLUE, "Invalid choice. Please try again. (y/n)")
-    else:
-        _printc(_bcolors.OKBLUE, "No more uncommitted changes were found!")
+    if choice == "y":
+        _printc(_bcolors.OKBLUE, "Commiting changes....")
+        output_msg = _git("commit", "-a", "-m", "[mlxp]: Automatically committing all changes", cwd=repo_path)
+        print(output_msg)
+        # 'commit -a' leaves no uncommitted changes behind.
+        changed_files = []
         done = True
-    return done
+    elif choice == "n":
+        done = True
+    else:
+        _printc(_bcolors.OKBLUE, "Invalid choice. Please try again. (y/n)")
+    return done, changed_files
 
 
-def _is_done_untracked_files(repo):
+def _is_done_untracked_files(repo_path):
     done = False
     # choice = _get_choice_untracked_files()
     # if choice == "y":
     file_to_track = _get_files_to_track()
     # If user input is not empty
-    _add_files_to_track(repo, file_to_track)
-    if not repo.untracked_files:
+    _add_files_to_track(repo_path, file_to_track)
+    untracked_files, _ = _get_status(repo_path)
+    if not untracked_files:
         done = True
     else:
         if not file_to_track:
             done = True
             _printc(_bcolors.OKBLUE, "Skipping untracked files!")
 
-    return done
+    return done, untracked_files
 
 
 def _get_choice_uncommited_changes():
@@ -363,14 +478,14 @@ def _get_files_to_track():
     return files_input
 
 
-def _add_files_to_track(repo, files_to_track):
+def _add_files_to_track(repo_path, files_to_track):
     if files_to_track:
         # Split user input by commas
-        files_to_add = files_to_track.split(",")
+        files_to_add = [file.strip() for file in files_to_track.split(",")]
 
         # Add selected files
+        _git("add", "--", *files_to_add, cwd=repo_path)
         for file in files_to_add:
-            repo.git.add(file.strip())
             _printc(_bcolors.OKGREEN, file + " is added to the repository")
         # Commit the changes
         # repo.index.commit("mlxp: Committing selected files ")
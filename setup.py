@@ -35,7 +35,6 @@ setup(
     install_requires=["hydra-core>=1.3.2", 
                       "omegaconf>=2.2.3", 
                       "dill>=0.3.6",
-                      "GitPython>=3.1.31",
                       "pandas>=1.3.4",
                       "ply>=3.11",
                       "PyYAML>=6.0",
@@ -0,0 +1,40 @@
+import pytest
+from omegaconf import OmegaConf
+
+from mlxp.data_structures.config_dict import ConfigDict, convert_dict
+
+# Unit tests for mlxp/data_structures/config_dict.py
+
+
+@pytest.fixture
+def config():
+	return OmegaConf.create({'seed': 1,
+				'lr': '${seed}',
+				'models': [{'name': 'a', 'layers': [{'units': 2}]}, {'name': 'b', 'layers': []}],
+				'shape': [1, 2]})
+
+
+def test_convert_dict_from_container(config):
+	# Conversion used by the launcher when as_ConfigDict is set
+	container = OmegaConf.to_container(config, resolve=True, throw_on_missing=True)
+	config_dict = convert_dict(container, src_class=dict, dst_class=ConfigDict)
+
+	assert config_dict.lr == 1
+	assert config_dict.shape == [1, 2]
+	assert isinstance(config_dict.models[0], ConfigDict)
+	assert config_dict.models[0].name == 'a'
+	assert config_dict.models[0].layers[0].units == 2
+	assert config_dict.models[1].name == 'b'
+
+
+def test_convert_dict_from_DictConfig(config):
+	config_dict = convert_dict(config)
+
+	assert isinstance(config_dict.models, list)
+	assert isinstance(config_dict.models[0], ConfigDict)
+	assert config_dict.models[0].layers[0].units == 2
+
+	# Converting back to plain dictionaries
+	plain = config_dict.to_dict()
+	assert type(plain['models'][0]) is dict
+	assert plain['models'][0] == {'name': 'a', 'layers': [{'units': 2}]}
@@ -0,0 +1,22 @@
+from omegaconf import OmegaConf
+
+from mlxp.launcher import _get_logger_kwargs
+from mlxp.logger import DefaultLogger, Logger
+
+# Unit tests for the instantiation of loggers in mlxp/launcher.py
+
+def test_get_logger_kwargs():
+	logger_cfg = OmegaConf.create({'parent_log_dir': './logs', 'forced_log_id': -1, 'flush_every': 5})
+
+	class OldLogger(Logger):
+		def __init__(self, parent_log_dir, forced_log_id):
+			super().__init__(parent_log_dir, forced_log_id)
+
+	class KwargsLogger(Logger):
+		def __init__(self, parent_log_dir, **kwargs):
+			super().__init__(parent_log_dir, **kwargs)
+
+	# flush_every is only passed to loggers that accept it
+	assert _get_logger_kwargs(OldLogger, logger_cfg) == {'parent_log_dir': './logs', 'forced_log_id': -1}
+	for logger_class in [DefaultLogger, KwargsLogger]:
+		assert _get_logger_kwargs(logger_class, logger_cfg)['flush_every'] == 5
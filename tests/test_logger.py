@@ -1,5 +1,6 @@
 import os
 import pytest
+import yaml
 from mlxp.logger import Logger
 from mlxp.data_structures.config_dict import convert_dict
 
@@ -74,6 +75,103 @@ def test_log_metrics(logger):
 	# Assert loaded metric dict is equal to the original
 	assert metrics == metric_dict
 
+def _read_metrics(logger, log_name):
+	import json
+	file_name = os.path.join(logger.log_dir,'metrics',log_name+'.json')
+	if not os.path.exists(file_name):
+		return []
+	with open(file_name) as file:
+		return [json.loads(line) for line in file]
+
+def _read_keys(logger, log_name):
+	import yaml
+	file_name = os.path.join(logger.log_dir,'metrics','.keys',log_name+'.yaml')
+	if not os.path.exists(file_name):
+		return []
+	with open(file_name) as file:
+		return list(yaml.safe_load(file) or {})
+
+def test_log_metrics_flush_every(logger):
+	# Lines are written by batches of flush_every lines
+	log_dir = os.path.abspath('logs')
+	buffered_logger = Logger(log_dir, flush_every=3)
+
+	buffered_logger.log_metrics({'loss': 1., 'epoch':0}, 'train')
+	buffered_logger.log_metrics({'loss': 0.5, 'epoch':1, 'acc': 0.1}, 'train')
+	assert _read_metrics(buffered_logger, 'train') == []
+	assert _read_keys(buffered_logger, 'train') == []
+
+	buffered_logger.log_metrics({'loss': 0.2, 'epoch':2}, 'train')
+	assert len(_read_metrics(buffered_logger, 'train')) == 3
+	assert set(_read_keys(buffered_logger, 'train')) == {'loss', 'epoch', 'acc'}
+
+	# flush writes the remaining lines and keys
+	buffered_logger.log_metrics({'loss': 0.1, 'epoch':3, 'lr': 0.01}, 'train')
+	assert len(_read_metrics(buffered_logger, 'train')) == 3
+	buffered_logger.flush()
+	assert _read_metrics(buffered_logger, 'train')[-1] == {'loss': 0.1, 'epoch':3, 'lr': 0.01}
+	assert 'lr' in _read_keys(buffered_logger, 'train')
+
+	# close writes the remaining lines, and files are opened again when logging
+	buffered_logger.log_metrics({'loss': 0.05, 'epoch':4}, 'train')
+	buffered_logger.close()
+	assert len(_read_metrics(buffered_logger, 'train')) == 5
+	buffered_logger.log_metrics({'loss': 0.01, 'epoch':5}, 'train')
+	buffered_logger.close()
+	assert len(_read_metrics(buffered_logger, 'train')) == 6
+
+def test_log_metrics_keys_per_log_name(logger):
+	# Keys are written with the lines of their own log name only
+	log_dir = os.path.abspath('logs')
+	buffered_logger = Logger(log_dir, flush_every=2)
+
+	buffered_logger.log_metrics({'loss': 1.}, 'train')
+	buffered_logger.log_metrics({'acc': 0.1}, 'eval')
+	buffered_logger.log_metrics({'loss': 0.5}, 'train')
+	assert len(_read_metrics(buffered_logger, 'train')) == 2
+	assert _read_keys(buffered_logger, 'train') == ['loss']
+	assert _read_metrics(buffered_logger, 'eval') == []
+	assert _read_keys(buffered_logger, 'eval') == []
+
+	buffered_logger.log_metrics({'acc': 0.2}, 'eval')
+	assert len(_read_metrics(buffered_logger, 'eval')) == 2
+	assert _read_keys(buffered_logger, 'eval') == ['acc']
+	buffered_logger.close()
+
+def test_log_metrics_finalizer(logger):
+	# Lines that are not written yet are written when the logger is deleted
+	import gc
+	log_dir = os.path.abspath('logs')
+	buffered_logger = Logger(log_dir, flush_every=10)
+	buffered_logger.log_metrics({'loss': 1., 'epoch':0}, 'train')
+	metrics_file = os.path.join(buffered_logger.log_dir,'metrics','train.json')
+	keys_file = os.path.join(buffered_logger.log_dir,'metrics','.keys','train.yaml')
+	assert _read_metrics(buffered_logger, 'train') == []
+
+	del buffered_logger
+	gc.collect()
+	with open(metrics_file) as file:
+		assert len(file.readlines()) == 1
+	with open(keys_file) as file:
+		assert set(yaml.safe_load(file)) == {'loss', 'epoch'}
+
+def test_log_metrics_custom_writer(logger):
+	# Subclasses may write the metrics lines themselves
+	import json
+
+	class JsonLogger(Logger):
+		def _log_metrics(self, metrics_dict, file_name):
+			with open(file_name + '.json', 'a') as f:
+				f.write(json.dumps(metrics_dict) + '\n')
+
+	log_dir = os.path.abspath('logs')
+	json_logger = JsonLogger(log_dir)
+	json_logger.log_metrics({'loss': 1.}, 'train')
+	json_logger.log_metrics({'loss': 0.5, 'acc': 0.1}, 'train')
+
+	assert len(_read_metrics(json_logger, 'train')) == 2
+	assert set(_read_keys(json_logger, 'train')) == {'loss', 'acc'}
+
 def test_log_artifacts(logger):
 
 	# Log the artifacts
@@ -89,6 +187,22 @@ def test_log_artifacts(logger):
 	# Assert loaded artifact dict is equal to the original: these are two lists
 	assert loaded_artifacts == artifacts
 
+def test_log_numpy_artifacts(logger):
+	# A dictionary of arrays is restored as saved, in the file named artifact_name
+	import numpy as np
+	artifacts = {'weights': np.arange(6.).reshape(2, 3), 'steps': np.array([1, 2, 3])}
+	logger.log_artifacts(artifacts, artifact_name='arrays', artifact_type='numpy')
+
+	artifacts_dir = os.path.join(logger.log_dir,'artifacts','numpy')
+	assert os.listdir(artifacts_dir) == ['arrays']
+
+	for artifact_type in ['numpy', None]:
+		with logger.load_artifacts('arrays', artifact_type) as loaded_artifacts:
+			assert set(loaded_artifacts.keys()) == set(artifacts)
+			for key, value in artifacts.items():
+				np.testing.assert_array_equal(loaded_artifacts[key], value)
+				assert loaded_artifacts[key].dtype == value.dtype
+
 
 def test_register_artifact_type(logger):
 		
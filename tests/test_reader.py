@@ -172,6 +172,62 @@ def test_filter(reader):
 
 
 
+def test_refresh(reader):
+	# Refreshing the database reuses the runs that did not change
+	parent_log_dir = os.path.join(tutorial_path,'logs')
+	new_reader = mlxp.Reader(parent_log_dir, refresh=True)
+
+	assert len(new_reader) == len(reader)
+	assert set(new_reader.fields.index) == set(reader.fields.index)
+	assert len(new_reader.filter(query_string="config.seed == 1")) == len(reader.filter(query_string="config.seed == 1"))
+
+def _update_info(log_dir, **fields):
+	import yaml
+	info_file = os.path.join(log_dir,'metadata','info.yaml')
+	with open(info_file) as file:
+		info = yaml.safe_load(file)
+	info.update(fields)
+	with open(info_file, 'w') as file:
+		yaml.safe_dump(info, file)
+
+def test_refresh_changed_runs(reader):
+	# Refreshing the database reads the runs that were modified, added or deleted
+	import shutil
+	import yaml
+	parent_log_dir = os.path.join(tutorial_path,'logs')
+	num_runs = len(reader)
+
+	_update_info(os.path.join(parent_log_dir,'2'), status='FAILED')
+	new_log_dir = os.path.join(parent_log_dir,'100')
+	shutil.copytree(os.path.join(parent_log_dir,'1'), new_log_dir)
+	with open(os.path.join(new_log_dir,'metadata','info.yaml')) as file:
+		logger_info = yaml.safe_load(file)['logger']
+	logger_info.update({'log_id': 100, 'log_dir': new_log_dir})
+	_update_info(new_log_dir, logger=logger_info)
+	_delete_directory(os.path.join(parent_log_dir,'3'))
+
+	new_reader = mlxp.Reader(parent_log_dir, refresh=True)
+	log_ids = new_reader.filter()[:]['info.logger.log_id']
+
+	assert len(new_reader) == num_runs
+	assert 100 in log_ids
+	assert 3 not in log_ids
+	failed = new_reader.filter(query_string="info.status == 'FAILED'")
+	assert failed[:]['info.logger.log_id'] == [2]
+	assert len(new_reader.filter(query_string="info.logger.log_id == 1")) == 1
+
+
+def test_filter_cache(reader):
+	# Results of a repeated query are not affected by changes to previous results
+	query = "config.seed == 1"
+	results = reader.filter(query_string=query)
+	doubled = results.map((lambda x: 2*x, ('config.seed',), ('doubled_seed',)))
+	results.merge(doubled)
+
+	assert 'doubled_seed' in results.keys()
+	assert 'doubled_seed' not in reader.filter(query_string=query).keys()
+
+
 def test_diff(reader):
 	
 	results = reader.filter()
@@ -0,0 +1,84 @@
+import os
+import pytest
+import yaml
+from omegaconf import OmegaConf
+
+from mlxp import launcher
+from mlxp.logger import Logger
+from mlxp.scheduler import Schedulers_dict, _create_scheduler
+
+# Unit tests for the submission of array jobs in mlxp/scheduler.py and mlxp/launcher.py
+
+def _delete_directory(log_dir):
+	import shutil
+	if os.path.exists(log_dir):
+		shutil.rmtree(log_dir, ignore_errors=True)
+
+@pytest.fixture
+def log_dir():
+	log_dir = os.path.abspath('logs')
+	_delete_directory(log_dir)
+	yield log_dir
+	_delete_directory(log_dir)
+
+def _make_scheduler(directive, option_cmd=None):
+	# Scripts are 'submitted' with echo instead of the scheduler's command
+	spec = Schedulers_dict[directive]
+	_create_scheduler(spec)
+	import mlxp.scheduler
+	scheduler = getattr(mlxp.scheduler, spec['name'])(option_cmd=option_cmd, array_jobs=True)
+	scheduler.submission_cmd = 'echo'
+	return scheduler
+
+def _add_pending_jobs(log_dir, schedulers):
+	loggers = []
+	for scheduler in schedulers:
+		logger = Logger(log_dir)
+		job_path = scheduler.save_job_script('echo run\n', logger.log_dir)
+		info_cfg = OmegaConf.create({'info': {'status': 'SUBMITTED'}})
+		launcher._pending_jobs.append((scheduler, job_path, logger, OmegaConf.create({'seed': 0}), info_cfg))
+		loggers.append(logger)
+	return loggers
+
+def _read_info(logger):
+	with open(os.path.join(logger.log_dir, 'metadata', 'info.yaml')) as file:
+		return yaml.safe_load(file)
+
+@pytest.mark.parametrize('directive', ['#SBATCH', '#OAR'])
+def test_submit_array_job(log_dir, directive):
+	scheduler = _make_scheduler(directive, option_cmd=['-l walltime=1:00:00'])
+	loggers = _add_pending_jobs(log_dir, [scheduler] * 3)
+	launcher._submit_pending_jobs()
+	assert launcher._pending_jobs == []
+
+	array_script = os.path.join(log_dir, 'array_1-3', 'script.sh')
+	with open(array_script) as file:
+		script = file.read()
+
+	# One array job whose tasks are indexed from array_first_index
+	first = scheduler.array_first_index
+	array_cmd = scheduler.array_cmd.format(first=first, last=first + 2, num_jobs=3)
+	assert f'{scheduler.directive} {array_cmd}\n' in script
+	assert f'{scheduler.directive} -l walltime=1:00:00\n' in script
+	assert f'case "${scheduler.array_index_var}" in' in script
+	for index, logger in enumerate(loggers, first):
+		job_path = os.path.join(logger.log_dir, 'script.sh')
+		out_path = os.path.join(logger.log_dir, 'log.stdout')
+		err_path = os.path.join(logger.log_dir, 'log.stderr')
+		assert f"    {index}) /bin/bash {job_path!r} > {out_path!r} 2> {err_path!r} ;;\n" in script
+
+		# Each job knows its task in the array
+		info = _read_info(logger)
+		assert info['status'] == 'SUBMITTED'
+		assert info['scheduler']['array_index'] == index
+
+def test_submit_jobs_with_different_options(log_dir):
+	# Jobs whose options differ are not grouped in an array job
+	schedulers = [_make_scheduler('#SBATCH', option_cmd=['--mem=1G']),
+				_make_scheduler('#SBATCH', option_cmd=['--mem=2G'])]
+	loggers = _add_pending_jobs(log_dir, schedulers)
+	launcher._submit_pending_jobs()
+
+	assert not os.path.exists(os.path.join(log_dir, 'array_1-2'))
+	for logger in loggers:
+		assert 'array_index' not in _read_info(logger)['scheduler']
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import pytest
+
+from mlxp.version_manager import _get_status
+
+# Unit tests for the parsing of 'git status' in mlxp/version_manager.py
+
+def _git(repo_path, *args):
+	subprocess.run(['git', *args], cwd=repo_path, check=True, capture_output=True)
+
+def _write(repo_path, file_name, content='content\n'):
+	with open(os.path.join(repo_path, file_name), 'w') as file:
+		file.write(content)
+
+@pytest.fixture
+def repo(tmp_path):
+	repo_path = str(tmp_path)
+	_git(repo_path, 'init', '-q')
+	for file_name in ['a.txt', 'c.txt', 'z.txt']:
+		_write(repo_path, file_name, file_name + '\n')
+	_git(repo_path, 'add', '.')
+	_git(repo_path, '-c', 'user.name=mlxp', '-c', 'user.email=mlxp@mlxp', 'commit', '-q', '-m', 'init')
+	return repo_path
+
+def test_get_status(repo):
+	_write(repo, 'z.txt', 'changed\n')
+	_write(repo, 'new file.txt')
+
+	untracked_files, changed_files = _get_status(repo)
+	assert untracked_files == ['new file.txt']
+	assert changed_files == ['z.txt']
+
+def test_get_status_index_rename(repo):
+	_git(repo, 'mv', 'a.txt', 'b.txt')
+	_write(repo, 'z.txt', 'changed\n')
+
+	untracked_files, changed_files = _get_status(repo)
+	assert untracked_files == []
+	assert sorted(changed_files) == ['b.txt', 'z.txt']
+
+def test_get_status_worktree_rename(repo):
+	# The rename is only known to the worktree: ' R b.txt\0a.txt\0'
+	os.rename(os.path.join(repo, 'a.txt'), os.path.join(repo, 'b.txt'))
+	_git(repo, 'add', '-N', 'b.txt')
+	_write(repo, 'z.txt', 'changed\n')
+
+	untracked_files, changed_files = _get_status(repo)
+	assert untracked_files == []
+	assert sorted(changed_files) == ['b.txt', 'z.txt']